@@ -2,22 +2,29 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 import os
-from typing import TYPE_CHECKING
+import threading
+import time
+from typing import TYPE_CHECKING, Callable
 
-from openai import AzureOpenAI
+import fastjsonschema
+import orjson
 
 from agent.client import TicketingClient
-from agent.tools import TOOLS
+from agent.tools import TOOLS_TUPLE
 
 if TYPE_CHECKING:
-    from openai import AzureOpenAI as AzureOpenAIClient
+    from openai import AsyncAzureOpenAI as AsyncAzureOpenAIClient
 
 logger = logging.getLogger(__name__)
 
-SYSTEM_PROMPT = """You are a helpful support ticket assistant. You help users \
+# The prompt is split into an invariant block and a dynamic tail so that
+# provider-side prompt caching keys on the stable part. Anything that can
+# change between sessions (user name, workspace, date) belongs in the
+# context block; editing the invariant text busts the cache for everyone.
+SYSTEM_PROMPT_INVARIANT = """You are a helpful support ticket assistant. You help users \
 manage their support tickets by creating, viewing, updating, and deleting them.
 
 When users ask about tickets, use the available tools to interact with the \
@@ -33,12 +40,55 @@ When resolving a ticket (setting status to RESOLVED), a resolution note \
 explaining how the issue was fixed is required.
 """
 
+# Session-specific instructions appended after the invariant block. Empty for
+# now; populate it instead of editing SYSTEM_PROMPT_INVARIANT when dynamic
+# content is needed.
+SYSTEM_PROMPT_CONTEXT = ""
+
 MAX_TOOL_ITERATIONS = 10
+
+# Maps tool names to batch-endpoint operations and their required arguments,
+# used to coalesce a multi-call turn into one /tickets:batch request.
+TOOL_BATCH_OPS = {
+    "create_ticket": "create",
+    "list_tickets": "list",
+    "get_ticket": "get",
+    "update_ticket": "update",
+    "delete_ticket": "delete",
+}
+# Validators compiled once at import from each tool's JSON schema.
+# fastjsonschema generates specialized code per schema, so the per-call check
+# is a plain function call that rejects bad arguments (missing fields, wrong
+# types, invalid status values) before any HTTP round-trip is paid.
+_VALIDATORS = {
+    tool["function"]["name"]: fastjsonschema.compile(tool["function"]["parameters"])
+    for tool in TOOLS_TUPLE
+}
+# Read-only tools may be cached briefly within a conversation; any write
+# invalidates the cache so the model never sees state it just changed stale.
+READ_TOOLS = frozenset({"list_tickets", "get_ticket"})
+READ_CACHE_TTL = 5.0
+
+# Stub written over tool results that a later call to the same tool with the
+# same target has superseded, so large bodies are not resent several times.
+STALE_TOOL_RESULT = "[superseded by later call]"
+
 MAX_MESSAGE_HISTORY = 50
+# Trimming is deferred until history reaches this high-water mark so that each
+# request's message prefix extends the previous one. A sliding window would
+# shift the prefix every turn and defeat OpenAI's prompt-prefix caching.
+MESSAGE_HISTORY_HIGH_WATER = 2 * MAX_MESSAGE_HISTORY
+
 
+def _get_openai_client() -> tuple[AsyncAzureOpenAIClient, str]:
+    """Get the Azure OpenAI client.
+
+    The openai package is imported here rather than at module load: it
+    pulls in a heavy dependency tree, and deferring it lets the CLI print
+    its banner before the SDK is paid for.
+    """
+    from openai import AsyncAzureOpenAI
 
-def _get_openai_client() -> tuple[AzureOpenAIClient, str]:
-    """Get the Azure OpenAI client."""
     azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
     azure_key = os.getenv("AZURE_OPENAI_API_KEY")
     azure_deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT")
@@ -52,7 +102,7 @@ def _get_openai_client() -> tuple[AzureOpenAIClient, str]:
 
     logger.info("Using Azure OpenAI: %s", azure_endpoint)
     return (
-        AzureOpenAI(
+        AsyncAzureOpenAI(
             azure_endpoint=azure_endpoint,
             api_key=azure_key,
             api_version=azure_version,
@@ -61,152 +111,433 @@ def _get_openai_client() -> tuple[AzureOpenAIClient, str]:
     )
 
 
-def _validate_required_args(tool_name: str, arguments: dict, required: list[str]) -> str | None:
-    """Validate that required arguments are present. Returns error message or None."""
-    missing = [arg for arg in required if arg not in arguments]
-    if missing:
-        return f"Missing required arguments for {tool_name}: {', '.join(missing)}"
+def _encode_tool_result(result: dict) -> str:
+    """Encode a tool result for the model with the shared configuration.
+
+    Compact (no indentation): every newline-plus-indent in a tool message
+    becomes billable prompt tokens on all subsequent completions, and the
+    model parses compact JSON just as well. orjson emits UTF-8 without
+    \\uXXXX escaping, so unicode ticket text passes through unmangled.
+    """
+    return orjson.dumps(result, default=str).decode()
+
+
+def _initial_messages() -> list[dict]:
+    """Build the system messages that seed a conversation.
+
+    The context message is only included when it has content, so an empty
+    placeholder does not cost a message on every request.
+    """
+    messages: list[dict] = [{"role": "system", "content": SYSTEM_PROMPT_INVARIANT}]
+    if SYSTEM_PROMPT_CONTEXT:
+        messages.append({"role": "system", "content": SYSTEM_PROMPT_CONTEXT})
+    return messages
+
+
+def _validate_tool_args(tool_name: str, arguments: dict) -> str | None:
+    """Validate tool arguments against the tool's schema. Returns error message or None."""
+    try:
+        _VALIDATORS[tool_name](arguments)
+    except fastjsonschema.JsonSchemaException as e:
+        return f"Invalid arguments for {tool_name}: {e.message}"
     return None
 
 
 class TicketingAgent:
-    """Agent that uses Azure OpenAI function calling to interact with the Ticketing API."""
+    """Agent that uses Azure OpenAI function calling to interact with the Ticketing API.
+
+    The OpenAI and ticketing clients are async so that independent tool
+    calls returned in a single model turn can be executed concurrently.
+    The sync `chat()` wrapper keeps the CLI entry point simple.
+    """
 
     def __init__(self, api_base_url: str = "http://localhost:8000/v1"):
         self.client = TicketingClient(base_url=api_base_url)
         self.openai_client, self.model = _get_openai_client()
-        self.messages: list[dict] = [{"role": "system", "content": SYSTEM_PROMPT}]
+        # Reuse the frozen schema for every request instead of re-building it
+        self._tools = TOOLS_TUPLE
+        # Constant-time tool dispatch: tool arguments already arrive as a
+        # dict whose keys match the client method signatures, so they are
+        # forwarded directly as keyword arguments without repacking.
+        self._dispatch = {
+            "create_ticket": self.client.create_ticket,
+            "list_tickets": self.client.list_tickets,
+            "get_ticket": self.client.get_ticket,
+            "update_ticket": self.client.update_ticket,
+            "delete_ticket": self.client.delete_ticket,
+        }
+        # Short-TTL cache of read-only tool results, keyed by tool and args
+        self._read_cache: dict[tuple, tuple[float, str]] = {}
+        # Background loop for the sync chat()/close() wrappers, started on
+        # first use; see _ensure_loop for why one loop must persist.
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: threading.Thread | None = None
+        self.messages: list[dict] = _initial_messages()
         logger.info("Agent initialized with model=%s", self.model)
 
-    def _execute_tool(self, tool_name: str, arguments: dict) -> str:
-        """Execute a tool and return the result as a string."""
+    async def _execute_tool(self, tool_name: str, arguments: dict) -> str:
+        """Execute a tool and return the result as a string.
+
+        Results of read-only tools are served from a short-TTL cache when
+        the model re-reads state it already fetched this conversation; any
+        successful write clears the cache.
+        """
         logger.debug("Executing tool: %s with args: %s", tool_name, arguments)
 
-        try:
-            if tool_name == "create_ticket":
-                if error := _validate_required_args(tool_name, arguments, ["title", "description"]):
-                    result = {"success": False, "error": error}
-                else:
-                    result = self.client.create_ticket(
-                        title=arguments["title"],
-                        description=arguments["description"],
-                    )
-            elif tool_name == "list_tickets":
-                result = self.client.list_tickets(status=arguments.get("status"))
-            elif tool_name == "get_ticket":
-                if error := _validate_required_args(tool_name, arguments, ["ticket_id"]):
-                    result = {"success": False, "error": error}
-                else:
-                    result = self.client.get_ticket(ticket_id=arguments["ticket_id"])
-            elif tool_name == "update_ticket":
-                if error := _validate_required_args(tool_name, arguments, ["ticket_id"]):
-                    result = {"success": False, "error": error}
-                else:
-                    result = self.client.update_ticket(
-                        ticket_id=arguments["ticket_id"],
-                        title=arguments.get("title"),
-                        description=arguments.get("description"),
-                        status=arguments.get("status"),
-                        resolution=arguments.get("resolution"),
-                    )
-            elif tool_name == "delete_ticket":
-                if error := _validate_required_args(tool_name, arguments, ["ticket_id"]):
-                    result = {"success": False, "error": error}
-                else:
-                    result = self.client.delete_ticket(ticket_id=arguments["ticket_id"])
-            else:
-                logger.error("Unknown tool: %s", tool_name)
-                result = {"success": False, "error": f"Unknown tool: {tool_name}"}
-        except Exception as e:
-            logger.exception("Error executing tool %s", tool_name)
-            result = {"success": False, "error": f"Tool execution failed: {e}"}
+        cache_key = None
+        if tool_name in READ_TOOLS:
+            try:
+                cache_key = (tool_name, frozenset(arguments.items()))
+            except TypeError:
+                # Unhashable argument values; skip caching for this call
+                cache_key = None
+            cached = self._read_cache.get(cache_key) if cache_key else None
+            if cached and time.monotonic() - cached[0] < READ_CACHE_TTL:
+                logger.debug("Read cache hit for %s", tool_name)
+                return cached[1]
+
+        handler = self._dispatch.get(tool_name)
+        if handler is None:
+            logger.error("Unknown tool: %s", tool_name)
+            result = {"success": False, "error": f"Unknown tool: {tool_name}"}
+        elif error := _validate_tool_args(tool_name, arguments):
+            result = {"success": False, "error": error}
+        else:
+            try:
+                result = await handler(**arguments)
+            except TypeError as e:
+                logger.error("Invalid arguments for tool %s: %s", tool_name, e)
+                result = {"success": False, "error": f"Invalid arguments for {tool_name}: {e}"}
+            except Exception as e:
+                logger.exception("Error executing tool %s", tool_name)
+                result = {"success": False, "error": f"Tool execution failed: {e}"}
 
         logger.debug("Tool result: %s", result)
-        return json.dumps(result, indent=2, default=str)
+        encoded = _encode_tool_result(result)
+
+        if result.get("success"):
+            if cache_key is not None:
+                self._read_cache[cache_key] = (time.monotonic(), encoded)
+            elif tool_name not in READ_TOOLS:
+                # A successful write may change what any read returns; a
+                # read that merely failed to cache must not drop the rest.
+                self._read_cache.clear()
+
+        return encoded
 
     def _trim_message_history(self) -> None:
-        """Trim message history to prevent unbounded growth."""
-        if len(self.messages) > MAX_MESSAGE_HISTORY:
-            # Keep system message and recent messages
-            system_msg = self.messages[0]
-            recent_msgs = self.messages[-(MAX_MESSAGE_HISTORY - 1) :]
-            self.messages = [system_msg] + recent_msgs
+        """Trim message history to prevent unbounded growth.
+
+        History is append-only until it crosses MESSAGE_HISTORY_HIGH_WATER,
+        then drops back to MAX_MESSAGE_HISTORY in one step. This keeps the
+        message prefix stable between requests (cacheable by the API) and
+        only resets the cache at the high-water mark. Called only after a
+        final assistant response, never between tool iterations.
+        """
+        if len(self.messages) > MESSAGE_HISTORY_HIGH_WATER:
+            self._condense_tool_history()
+            # Keep leading system messages and recent messages
+            system_count = 1 + bool(SYSTEM_PROMPT_CONTEXT)
+            system_msgs = self.messages[:system_count]
+            recent_msgs = self.messages[-(MAX_MESSAGE_HISTORY - system_count) :]
+            self.messages = system_msgs + recent_msgs
             logger.debug("Trimmed message history to %d messages", len(self.messages))
 
-    def _message_to_dict(self, message) -> dict:
-        """Convert an SDK message object to a plain dictionary."""
-        msg_dict = {"role": message.role, "content": message.content}
-        if message.tool_calls:
-            msg_dict["tool_calls"] = [
-                {
-                    "id": tc.id,
-                    "type": tc.type,
-                    "function": {
-                        "name": tc.function.name,
-                        "arguments": tc.function.arguments,
-                    },
-                }
-                for tc in message.tool_calls
-            ]
-        return msg_dict
-
-    def chat(self, user_message: str) -> str:
-        """Process a user message and return the agent's response."""
-        self.messages.append({"role": "user", "content": user_message})
-        logger.debug("User message: %s", user_message[:100])
+    def _condense_tool_history(self) -> None:
+        """Replace superseded tool results with a short stub.
+
+        Long sessions accumulate the same ticket bodies several times:
+        list_tickets re-runs and get_ticket re-reads after updates. Only
+        the most recent result per (read tool, arguments) is kept
+        verbatim; earlier ones are rewritten to a placeholder. Write
+        results are never condensed — each one is unique information
+        (e.g. a created ticket's id), not a stale copy of a later call.
+        Runs only at history-reset points, together with trimming, so the
+        message prefix stays stable between ordinary turns.
+        """
+        # Map tool_call_id to a dedup key via the originating assistant message
+        keys_by_call_id: dict[str, tuple] = {}
+        for message in self.messages:
+            if message.get("role") == "assistant":
+                for tool_call in message.get("tool_calls") or []:
+                    name = tool_call["function"]["name"]
+                    if name not in READ_TOOLS:
+                        continue
+                    keys_by_call_id[tool_call["id"]] = (
+                        name,
+                        tool_call["function"]["arguments"],
+                    )
 
-        iterations = 0
-        while iterations < MAX_TOOL_ITERATIONS:
-            iterations += 1
-            logger.debug("Iteration %d/%d", iterations, MAX_TOOL_ITERATIONS)
+        condensed = 0
+        seen: set[tuple] = set()
+        for message in reversed(self.messages):
+            if message.get("role") != "tool" or message.get("content") == STALE_TOOL_RESULT:
+                continue
+            key = keys_by_call_id.get(message.get("tool_call_id"))
+            if key is None:
+                continue
+            if key in seen:
+                message["content"] = STALE_TOOL_RESULT
+                condensed += 1
+            else:
+                seen.add(key)
+
+        if condensed:
+            logger.debug("Condensed %d superseded tool results", condensed)
+
+    async def _stream_completion(
+        self, on_token: Callable[[str], None] | None = None
+    ) -> tuple[dict, str | None]:
+        """Stream one chat completion and assemble the assistant message.
+
+        Content tokens are forwarded to `on_token` as they arrive so
+        callers (e.g. the CLI) can render output before the full response
+        is complete. Tool-call fragments are merged by index into complete
+        tool calls.
+
+        Returns:
+            The assembled assistant message as a plain dictionary, and the
+            finish reason reported on the final chunk (None if absent).
+        """
+        stream = await self.openai_client.chat.completions.create(
+            model=self.model,
+            messages=self.messages,
+            tools=self._tools,
+            stream=True,
+        )
 
-            response = self.openai_client.chat.completions.create(
-                model=self.model,
-                messages=self.messages,
-                tools=TOOLS,
+        content_parts: list[str] = []
+        tool_calls_by_index: dict[int, dict] = {}
+        finish_reason: str | None = None
+
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+            delta = choice.delta
+
+            if delta.content:
+                content_parts.append(delta.content)
+                if on_token:
+                    on_token(delta.content)
+
+            if delta.tool_calls:
+                for fragment in delta.tool_calls:
+                    entry = tool_calls_by_index.setdefault(
+                        fragment.index,
+                        {"id": "", "type": "function", "function": {"name": "", "arguments": ""}},
+                    )
+                    if fragment.id:
+                        entry["id"] = fragment.id
+                    if fragment.function:
+                        if fragment.function.name:
+                            entry["function"]["name"] = fragment.function.name
+                        if fragment.function.arguments:
+                            entry["function"]["arguments"] += fragment.function.arguments
+
+        message: dict = {"role": "assistant", "content": "".join(content_parts) or None}
+        if tool_calls_by_index:
+            message["tool_calls"] = [tool_calls_by_index[i] for i in sorted(tool_calls_by_index)]
+        return message, finish_reason
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the agent's persistent event loop, starting it on first use.
+
+        The pooled connections held by TicketingClient and the OpenAI SDK
+        are bound to the loop they were opened on. Running each turn under
+        asyncio.run would hand a keep-alive socket from turn 1's (closed)
+        loop to turn 2 and fail with "Event loop is closed", so the sync
+        wrappers share one loop on a background thread for the agent's
+        lifetime.
+        """
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(
+                target=self._loop.run_forever, name="agent-event-loop", daemon=True
             )
+            self._loop_thread.start()
+        return self._loop
 
-            if not response.choices:
-                logger.error("No choices in API response")
-                return "I received an unexpected response from the AI service. Please try again."
+    def chat(self, user_message: str, on_token: Callable[[str], None] | None = None) -> str:
+        """Process a user message and return the agent's response.
 
-            message = response.choices[0].message
+        Synchronous wrapper around `achat` for CLI compatibility.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self.achat(user_message, on_token), self._ensure_loop()
+        )
+        return future.result()
 
-            if message.tool_calls:
-                self.messages.append(self._message_to_dict(message))
+    async def achat(self, user_message: str, on_token: Callable[[str], None] | None = None) -> str:
+        """Process a user message and return the agent's response.
 
-                for tool_call in message.tool_calls:
-                    tool_name = tool_call.function.name
-                    try:
-                        arguments = json.loads(tool_call.function.arguments)
-                    except json.JSONDecodeError as e:
-                        logger.error("Failed to parse tool arguments: %s", e)
-                        arguments = {}
+        Args:
+            user_message: The user's natural-language request.
+            on_token: Optional callback invoked with each content token as
+                it streams in, before the full response is available.
+        """
+        self.messages.append({"role": "user", "content": user_message})
+        logger.debug("User message: %s", user_message[:100])
 
-                    tool_result = self._execute_tool(tool_name, arguments)
+        iterations = 0
+        previous_call_signature = None
+        while iterations < MAX_TOOL_ITERATIONS:
+            iterations += 1
+            logger.debug("Iteration %d/%d", iterations, MAX_TOOL_ITERATIONS)
 
+            message, finish_reason = await self._stream_completion(on_token)
+
+            if finish_reason == "length":
+                # The completion was cut off at the output token limit; any
+                # tool calls in it may be truncated mid-arguments, and
+                # another round-trip cannot recover them.
+                logger.warning("Completion stopped at the token limit; ending tool loop")
+                message.pop("tool_calls", None)
+                if not message.get("content"):
+                    # The API rejects an assistant message with null content
+                    # and no tool calls on the next turn; store the fallback
+                    # text the user sees instead.
+                    message["content"] = (
+                        "The response was cut off at the model's output limit. "
+                        "Please try a more specific request."
+                    )
+                self.messages.append(message)
+                self._trim_message_history()
+                return message["content"]
+
+            self.messages.append(message)
+            tool_calls = message.get("tool_calls")
+
+            if tool_calls:
+                # A model stuck re-issuing the identical tool calls would
+                # burn the remaining iterations on API round-trips that
+                # cannot produce new information; stop it after one repeat.
+                signature = frozenset(
+                    (call["function"]["name"], call["function"]["arguments"]) for call in tool_calls
+                )
+                if signature == previous_call_signature:
+                    logger.warning("Model repeated the previous tool calls; ending tool loop")
+                    duplicate_result = _encode_tool_result(
+                        {
+                            "success": False,
+                            "error": "Duplicate of the previous tool call; stopped to avoid a loop",
+                        }
+                    )
+                    for tool_call in tool_calls:
+                        self.messages.append(
+                            {
+                                "role": "tool",
+                                "tool_call_id": tool_call["id"],
+                                "content": duplicate_result,
+                            }
+                        )
+                    break
+                previous_call_signature = signature
+
+                # A multi-call turn is coalesced into one /tickets:batch
+                # request instead of paying one round-trip per tool call.
+                if len(tool_calls) > 1:
+                    tool_results = await self._execute_tool_batch(tool_calls)
+                else:
+                    tool_call = tool_calls[0]
+                    tool_results = [
+                        await self._execute_tool(
+                            tool_call["function"]["name"],
+                            self._parse_arguments(tool_call["function"]["arguments"]),
+                        )
+                    ]
+
+                for tool_call, tool_result in zip(tool_calls, tool_results):
                     self.messages.append(
                         {
                             "role": "tool",
-                            "tool_call_id": tool_call.id,
+                            "tool_call_id": tool_call["id"],
                             "content": tool_result,
                         }
                     )
             else:
-                self.messages.append(self._message_to_dict(message))
                 self._trim_message_history()
-                return message.content or ""
+                return message.get("content") or ""
 
-        logger.warning("Max iterations reached, returning partial response")
+        logger.warning("Tool loop ended without a final response after %d iterations", iterations)
         self._trim_message_history()
         return "I apologize, but I was unable to complete the request. Please try again."
 
+    async def _execute_tool_batch(self, tool_calls) -> list[str]:
+        """Execute one turn's tool calls as a single batch API request.
+
+        Tool calls that fail local validation (unknown tool, missing
+        required arguments) get an error result without being sent to the
+        API; the rest are coalesced into one /tickets:batch request.
+
+        Returns:
+            JSON-encoded results in the same order as the tool calls.
+        """
+        results: list[str | None] = [None] * len(tool_calls)
+        operations = []
+        operation_indices = []
+
+        for i, tool_call in enumerate(tool_calls):
+            tool_name = tool_call["function"]["name"]
+            arguments = self._parse_arguments(tool_call["function"]["arguments"])
+
+            op = TOOL_BATCH_OPS.get(tool_name)
+            if op is None:
+                logger.error("Unknown tool: %s", tool_name)
+                result = {"success": False, "error": f"Unknown tool: {tool_name}"}
+            elif error := _validate_tool_args(tool_name, arguments):
+                result = {"success": False, "error": error}
+            else:
+                operations.append({"op": op, "args": arguments})
+                operation_indices.append(i)
+                continue
+            results[i] = _encode_tool_result(result)
+
+        if operations:
+            logger.debug("Executing batch of %d operations", len(operations))
+            response = await self.client.batch(operations)
+            if any(operation["op"] not in ("list", "get") for operation in operations):
+                # The batch may have written state; drop cached reads
+                self._read_cache.clear()
+            if response["success"]:
+                for i, op_result in zip(operation_indices, response["data"]):
+                    results[i] = _encode_tool_result(op_result)
+            else:
+                # The batch request itself failed; report it for every call
+                failure = _encode_tool_result(response)
+                for i in operation_indices:
+                    results[i] = failure
+
+        return results
+
+    @staticmethod
+    def _parse_arguments(arguments: str) -> dict:
+        """Parse a tool call's JSON arguments, falling back to an empty dict."""
+        try:
+            return orjson.loads(arguments)
+        except orjson.JSONDecodeError as e:
+            logger.error("Failed to parse tool arguments: %s", e)
+            return {}
+
     def reset_conversation(self) -> None:
         """Reset the conversation history."""
-        self.messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+        self.messages = _initial_messages()
+        self._read_cache.clear()
         logger.info("Conversation reset")
 
     def close(self) -> None:
-        """Close the HTTP client."""
-        self.client.close()
+        """Close the HTTP client and stop the background event loop."""
+        if self._loop is not None:
+            # Close on the loop that owns the client's connections
+            asyncio.run_coroutine_threadsafe(self.client.close(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            self._loop.close()
+            self._loop = None
+            self._loop_thread = None
+        else:
+            # chat() was never called; no connections are bound to a loop
+            asyncio.run(self.client.close())
         logger.debug("Agent closed")
@@ -10,36 +10,44 @@ import logging
 import os
 import sys
 import threading
-import time
 
 from agent.agent import TicketingAgent
 
 
 class Spinner:
-    """A simple CLI spinner for loading states."""
+    """A simple CLI spinner for loading states.
+
+    The spin loop blocks on an Event instead of polling time.sleep, so the
+    thread stays idle between frames and stop() returns immediately rather
+    than waiting out the current sleep interval.
+    """
 
     def __init__(self, message: str = "Thinking"):
         self.message = message
         self.frames = itertools.cycle(["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"])
-        self.running = False
         self.thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
 
     def _spin(self) -> None:
-        while self.running:
+        while not self._stop_event.wait(0.1):
             frame = next(self.frames)
             print(f"\r{frame} {self.message}...", end="", flush=True)
-            time.sleep(0.1)
 
     def start(self) -> None:
-        self.running = True
+        # Skip the animation entirely when output is piped (e.g. CI logs)
+        if not sys.stdout.isatty():
+            return
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self._spin, daemon=True)
         self.thread.start()
 
     def stop(self) -> None:
-        self.running = False
+        # Idempotent so it can be called both on first token and in finally
+        self._stop_event.set()
         if self.thread:
             self.thread.join()
-        print("\r" + " " * (len(self.message) + 10) + "\r", end="", flush=True)
+            self.thread = None
+            print("\r" + " " * (len(self.message) + 10) + "\r", end="", flush=True)
 
 
 HELP_TEXT = """
@@ -125,14 +133,29 @@ def main() -> None:
                 continue
 
             spinner = Spinner("Thinking")
+            streamed = False
+
+            def handle_token(token: str, spinner: Spinner = spinner) -> None:
+                # Stop the spinner on the first token and print the rest
+                # as they arrive, instead of waiting for the full response.
+                nonlocal streamed
+                if not streamed:
+                    spinner.stop()
+                    print("\nAgent: ", end="", flush=True)
+                    streamed = True
+                print(token, end="", flush=True)
+
             try:
                 spinner.start()
-                response = agent.chat(user_input)
+                response = agent.chat(user_input, on_token=handle_token)
             except Exception as e:
                 logger.exception("Error during chat")
                 print(f"\nError: {e}\n")
             else:
-                print(f"\nAgent: {response}\n")
+                if streamed:
+                    print("\n")
+                else:
+                    print(f"\nAgent: {response}\n")
             finally:
                 spinner.stop()
 
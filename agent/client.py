@@ -7,6 +7,7 @@ import os
 from types import TracebackType
 
 import httpx
+import orjson
 
 from agent.types import ApiResponse
 
@@ -16,13 +17,15 @@ DEFAULT_BASE_URL = "http://localhost:8000/v1"
 
 
 class TicketingClient:
-    """Client for interacting with the Ticketing API.
+    """Async client for interacting with the Ticketing API.
 
-    Supports context manager protocol for proper resource cleanup.
+    All request methods are coroutines so independent calls can be
+    dispatched concurrently (e.g. via asyncio.gather). Supports the async
+    context manager protocol for proper resource cleanup.
 
     Example:
-        with TicketingClient() as client:
-            result = client.list_tickets()
+        async with TicketingClient() as client:
+            result = await client.list_tickets()
     """
 
     def __init__(
@@ -37,19 +40,34 @@ class TicketingClient:
         key = api_key or os.getenv("API_KEY")
         if key:
             headers["X-API-Key"] = key
-        self.client = httpx.Client(timeout=timeout, headers=headers)
+        # HTTP/2 multiplexes concurrent tool-call requests over one
+        # connection, and the long keepalive expiry keeps that connection
+        # warm across user think time between messages.
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            headers=headers,
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(
+                    max_keepalive_connections=10,
+                    max_connections=20,
+                    keepalive_expiry=60,
+                ),
+                retries=1,
+            ),
+        )
         logger.debug("Initialized client with base_url=%s", base_url)
 
-    def __enter__(self) -> TicketingClient:
+    async def __aenter__(self) -> TicketingClient:
         return self
 
-    def __exit__(
+    async def __aexit__(
         self,
         exc_type: type[BaseException] | None,
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> None:
-        self.close()
+        await self.close()
 
     def _handle_response(self, response: httpx.Response) -> ApiResponse:
         """Handle API response, returning structured result."""
@@ -57,8 +75,8 @@ class TicketingClient:
 
         if response.status_code >= 400:
             try:
-                error_detail = response.json().get("detail", response.text)
-            except (ValueError, KeyError):
+                error_detail = orjson.loads(response.content).get("detail", response.text)
+            except (ValueError, KeyError, AttributeError):
                 error_detail = response.text
 
             logger.warning("API error: %d - %s", response.status_code, error_detail)
@@ -71,9 +89,9 @@ class TicketingClient:
         if response.status_code == 204:
             return {"success": True, "data": None}
 
-        return {"success": True, "data": response.json()}
+        return {"success": True, "data": orjson.loads(response.content)}
 
-    def _request(
+    async def _request(
         self,
         method: str,
         path: str,
@@ -84,7 +102,7 @@ class TicketingClient:
         logger.debug("Request: %s %s", method, url)
 
         try:
-            response = self.client.request(method, url, **kwargs)
+            response = await self.client.request(method, url, **kwargs)
             return self._handle_response(response)
         except httpx.ConnectError as e:
             logger.error("Connection failed: %s", e)
@@ -101,26 +119,26 @@ class TicketingClient:
                 "error": f"Request timed out: {e}",
             }
 
-    def create_ticket(self, title: str, description: str) -> ApiResponse:
+    async def create_ticket(self, title: str, description: str) -> ApiResponse:
         """Create a new ticket."""
-        return self._request(
+        return await self._request(
             "POST",
             "/tickets",
             json={"title": title, "description": description},
         )
 
-    def list_tickets(self, status: str | None = None) -> ApiResponse:
+    async def list_tickets(self, status: str | None = None) -> ApiResponse:
         """List all tickets, optionally filtered by status."""
         params = {}
         if status:
             params["status"] = status
-        return self._request("GET", "/tickets", params=params)
+        return await self._request("GET", "/tickets", params=params)
 
-    def get_ticket(self, ticket_id: str) -> ApiResponse:
+    async def get_ticket(self, ticket_id: str) -> ApiResponse:
         """Get a specific ticket by ID."""
-        return self._request("GET", f"/tickets/{ticket_id}")
+        return await self._request("GET", f"/tickets/{ticket_id}")
 
-    def update_ticket(
+    async def update_ticket(
         self,
         ticket_id: str,
         title: str | None = None,
@@ -139,13 +157,22 @@ class TicketingClient:
         if resolution is not None:
             data["resolution"] = resolution
 
-        return self._request("PATCH", f"/tickets/{ticket_id}", json=data)
+        return await self._request("PATCH", f"/tickets/{ticket_id}", json=data)
 
-    def delete_ticket(self, ticket_id: str) -> ApiResponse:
+    async def delete_ticket(self, ticket_id: str) -> ApiResponse:
         """Delete a ticket."""
-        return self._request("DELETE", f"/tickets/{ticket_id}")
+        return await self._request("DELETE", f"/tickets/{ticket_id}")
+
+    async def batch(self, operations: list[dict]) -> ApiResponse:
+        """Execute multiple ticket operations in a single request.
+
+        Args:
+            operations: List of {"op": ..., "args": ...} dicts as accepted
+                by the /tickets:batch endpoint.
+        """
+        return await self._request("POST", "/tickets:batch", json=operations)
 
-    def close(self) -> None:
+    async def close(self) -> None:
         """Close the HTTP client."""
-        self.client.close()
+        await self.client.aclose()
         logger.debug("Client closed")
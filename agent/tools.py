@@ -1,6 +1,6 @@
 """OpenAI function tool definitions for the Ticketing API."""
 
-TOOLS = [
+TOOLS: list[dict] = [
     {
         "type": "function",
         "function": {
@@ -109,3 +109,8 @@ TOOLS = [
         },
     },
 ]
+
+# Frozen once at import time. The schema never changes at runtime, so callers
+# should pass this same object to every chat.completions.create call instead
+# of rebuilding or copying the tool list per request.
+TOOLS_TUPLE: tuple[dict, ...] = tuple(TOOLS)
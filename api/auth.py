@@ -21,9 +21,15 @@ API_KEY_HEADER = APIKeyHeader(name=API_KEY_HEADER_NAME, auto_error=False)
 
 
 @lru_cache(maxsize=1)
-def get_api_key() -> str | None:
-    """Get the API key from environment, cached at first call."""
-    return os.getenv("API_KEY")
+def get_api_key() -> bytes | None:
+    """Get the API key from environment as bytes, cached at first call.
+
+    Stored pre-encoded so the per-request comparison is a single
+    compare_digest over bytes instead of paying a str-to-bytes
+    conversion on every request.
+    """
+    key = os.getenv("API_KEY")
+    return key.encode() if key else None
 
 
 def clear_api_key_cache() -> None:
@@ -61,7 +67,7 @@ async def verify_api_key(
             detail="Missing API key. Include 'X-API-Key' header.",
         )
 
-    if not secrets.compare_digest(api_key, expected_key):
+    if not secrets.compare_digest(api_key.encode(), expected_key):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API key",
@@ -6,7 +6,7 @@ including request/response models and enumerations for ticket status.
 
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Any, Literal, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -82,3 +82,31 @@ class Ticket(TicketBase):
     created: datetime
     status: TicketStatus = TicketStatus.OPEN
     resolution: Optional[str] = None
+
+
+class BatchOperation(BaseModel):
+    """A single operation within a batch request.
+
+    Attributes:
+        op: The operation to perform (create, get, list, update, or delete).
+        args: Arguments for the operation, matching the corresponding
+            single-operation endpoint (e.g. title/description for create,
+            ticket_id for get/update/delete).
+    """
+
+    op: Literal["create", "get", "list", "update", "delete"]
+    args: dict = Field(default_factory=dict)
+
+
+class BatchResult(BaseModel):
+    """Result of a single operation within a batch request.
+
+    Attributes:
+        success: Whether the operation succeeded.
+        data: Operation result (a ticket, a list of tickets, or None).
+        error: Error message when the operation failed.
+    """
+
+    success: bool
+    data: Optional[Any] = None
+    error: Optional[str] = None
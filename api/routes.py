@@ -13,3 +13,4 @@ router = APIRouter()
 
 # Include V1 endpoints under /v1 prefix
 router.include_router(v1_endpoints.router, prefix="/v1")
+router.include_router(v1_endpoints.batch_router, prefix="/v1")
@@ -4,29 +4,127 @@ This module provides a simple storage layer that keeps tickets in memory.
 All operations are thread-safe, suitable for concurrent API requests.
 """
 
+import os
+import random
 import threading
 import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from typing import Optional
 
 from api.models import Ticket, TicketCreate, TicketStatus, TicketUpdate
 
+# uuid.uuid4() reads os.urandom — a syscall — per id. Ticket ids only need
+# uniqueness, not cryptographic strength, so a PRNG seeded once from the OS
+# generates them without entering the kernel on every create.
+_id_rng = random.Random(os.urandom(16))
+
+
+def _new_ticket_id() -> uuid.UUID:
+    """Generate a random version-4 ticket id without a per-call syscall."""
+    return uuid.UUID(int=_id_rng.getrandbits(128), version=4)
+
+
+class RWLock:
+    """Readers-writer lock that lets concurrent reads proceed in parallel.
+
+    Any number of readers may hold the lock at once; a writer gets
+    exclusive access. Waiting writers block new readers so a stream of
+    reads cannot starve writes.
+    """
+
+    def __init__(self):
+        """Initialize the lock with no readers or writers."""
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Acquire the lock for shared (read) access."""
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Acquire the lock for exclusive (write) access."""
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
 
 class TicketStorage:
     """Thread-safe in-memory storage for tickets.
 
-    Uses a dictionary to store tickets and RLock for thread safety.
+    Uses a dictionary to store tickets, guarded by a readers-writer lock:
+    the workload is read-dominated, so concurrent get/list_all calls
+    proceed in parallel while create/update/delete take exclusive access.
     Data is lost when the application restarts.
 
+    Listing uses a copy-on-write snapshot: writers rebuild pre-sorted
+    tuples and publish them with a single atomic attribute store, so
+    list_all reads the current snapshot without taking any lock.
+
+    Stored Ticket instances are treated as immutable: update replaces a
+    ticket with a fresh model rather than mutating it in place, so read
+    paths hand out stored references directly without defensive copies.
+    Any future mutation must go through update to preserve this
+    invariant.
+
     Attributes:
         _tickets: Internal dictionary mapping ticket IDs to Ticket objects.
-        _lock: Reentrant lock for thread-safe operations.
+        _rw: Readers-writer lock for thread-safe operations.
+        _snapshot: Published tuple of all tickets, newest first.
+        _snapshot_by_status: Published per-status tuples, newest first.
     """
 
     def __init__(self):
         """Initialize empty storage with a lock."""
-        self._tickets: dict[str, Ticket] = {}
-        self._lock = threading.RLock()
+        self._tickets: dict[uuid.UUID, Ticket] = {}
+        self._rw = RWLock()
+        self._snapshot: tuple[Ticket, ...] = ()
+        self._snapshot_by_status: dict[TicketStatus, tuple[Ticket, ...]] = {}
+
+    def _publish_snapshots(self) -> None:
+        """Rebuild and publish the read snapshots. Call with the write lock held.
+
+        Readers pick up the new tuples through a single attribute load;
+        CPython attribute assignment is atomic, so list_all never sees a
+        half-built snapshot.
+
+        Tickets are only ever appended with monotonically increasing
+        creation times, and dicts preserve insertion order (updates keep
+        a key's position), so newest-first is simply reversed insertion
+        order — no sort needed.
+        """
+        tickets = tuple(reversed(self._tickets.values()))
+        # Bucket by status in a single pass rather than re-scanning the
+        # full collection once per status.
+        buckets: dict[TicketStatus, list[Ticket]] = {status: [] for status in TicketStatus}
+        for ticket in tickets:
+            buckets[ticket.status].append(ticket)
+        self._snapshot_by_status = {status: tuple(group) for status, group in buckets.items()}
+        self._snapshot = tickets
 
     def create(self, data: TicketCreate) -> Ticket:
         """Create a new ticket.
@@ -37,29 +135,29 @@ class TicketStorage:
         Returns:
             The created ticket with generated ID and timestamp.
         """
-        with self._lock:
+        with self._rw.write():
             ticket = Ticket(
-                id=uuid.uuid4(),
+                id=_new_ticket_id(),
                 title=data.title,
                 description=data.description,
                 created=datetime.now(timezone.utc),
                 status=TicketStatus.OPEN,
             )
-            self._tickets[str(ticket.id)] = ticket
+            self._tickets[ticket.id] = ticket
+            self._publish_snapshots()
             return ticket
 
-    def get(self, ticket_id: str) -> Optional[Ticket]:
+    def get(self, ticket_id: uuid.UUID) -> Optional[Ticket]:
         """Get a ticket by ID.
 
         Args:
             ticket_id: The unique identifier of the ticket.
 
         Returns:
-            A copy of the ticket if found, None otherwise.
+            The ticket if found, None otherwise.
         """
-        with self._lock:
-            ticket = self._tickets.get(ticket_id)
-            return ticket.model_copy() if ticket else None
+        with self._rw.read():
+            return self._tickets.get(ticket_id)
 
     def list_all(
         self,
@@ -75,17 +173,14 @@ class TicketStorage:
             limit: Maximum number of records to return.
 
         Returns:
-            List of ticket copies sorted by creation date (newest first).
+            List of tickets sorted by creation date (newest first).
         """
-        with self._lock:
-            tickets = list(self._tickets.values())
-            if status:
-                tickets = [t for t in tickets if t.status == status]
-            sorted_tickets = sorted(tickets, key=lambda t: t.created, reverse=True)
-            paginated = sorted_tickets[skip : skip + limit]
-            return [t.model_copy() for t in paginated]
-
-    def update(self, ticket_id: str, data: TicketUpdate) -> Optional[Ticket]:
+        # Lock-free read: the snapshot tuple is immutable and already
+        # sorted, so filtering and pagination reduce to one slice.
+        snapshot = self._snapshot_by_status.get(status, ()) if status else self._snapshot
+        return list(snapshot[skip : skip + limit])
+
+    def update(self, ticket_id: uuid.UUID, data: TicketUpdate) -> Optional[Ticket]:
         """Update an existing ticket.
 
         Args:
@@ -95,17 +190,22 @@ class TicketStorage:
         Returns:
             The updated ticket if found, None otherwise.
         """
-        with self._lock:
+        with self._rw.write():
             ticket = self._tickets.get(ticket_id)
             if not ticket:
                 return None
 
-            update_fields = data.model_dump(exclude_unset=True)
+            # Equivalent to model_dump(exclude_unset=True) for this flat
+            # model, without walking the schema or building through the
+            # dump machinery — the set of explicitly provided fields is
+            # already tracked on the instance.
+            update_fields = {name: getattr(data, name) for name in data.model_fields_set}
             updated_ticket = ticket.model_copy(update=update_fields)
             self._tickets[ticket_id] = updated_ticket
-            return updated_ticket.model_copy()
+            self._publish_snapshots()
+            return updated_ticket
 
-    def delete(self, ticket_id: str) -> bool:
+    def delete(self, ticket_id: uuid.UUID) -> bool:
         """Delete a ticket.
 
         Args:
@@ -114,12 +214,19 @@ class TicketStorage:
         Returns:
             True if the ticket was deleted, False if not found.
         """
-        with self._lock:
+        with self._rw.write():
             if ticket_id in self._tickets:
                 del self._tickets[ticket_id]
+                self._publish_snapshots()
                 return True
             return False
 
+    def clear(self) -> None:
+        """Remove all tickets. Useful for testing."""
+        with self._rw.write():
+            self._tickets.clear()
+            self._publish_snapshots()
+
 
 # Global storage instance
 storage = TicketStorage()
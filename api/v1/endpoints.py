@@ -5,24 +5,85 @@ It provides create, read, update, and delete operations with proper
 error handling and validation.
 """
 
+from functools import lru_cache
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter, ValidationError
 
 from api.auth import verify_api_key
-from api.models import Ticket, TicketCreate, TicketStatus, TicketUpdate
+from api.models import (
+    BatchOperation,
+    BatchResult,
+    Ticket,
+    TicketCreate,
+    TicketStatus,
+    TicketUpdate,
+)
 from api.storage import storage
 
+
+@lru_cache(maxsize=4096)
+def _parse_uuid(value: str) -> Optional[UUID]:
+    """Parse a ticket id string into a UUID, caching hot keys.
+
+    Repeated access to the same ticket (e.g. polling) reuses the parsed
+    object instead of re-validating the 36-character string each time.
+
+    Returns:
+        The parsed UUID, or None if the value is malformed.
+    """
+    try:
+        return UUID(value)
+    except ValueError:
+        return None
+
+
+def _ticket_id_param(ticket_id: str) -> UUID:
+    """Resolve the ticket_id path parameter through the parse cache.
+
+    Raises:
+        HTTPException: 422 if the value is not a valid UUID.
+    """
+    parsed = _parse_uuid(ticket_id)
+    if parsed is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=f"Ticket ID '{ticket_id}' is not a valid UUID",
+        )
+    return parsed
+
+
+def _not_found(ticket_id: UUID) -> HTTPException:
+    """Build the 404 response for a missing ticket."""
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Ticket with ID '{ticket_id}' not found",
+    )
+
+
+# Pre-built adapter that serializes stored tickets straight to JSON bytes.
+# Storage only ever holds valid Ticket instances, so re-validating each item
+# through the response model on every request is pure overhead.
+_TICKET_LIST_ADAPTER = TypeAdapter(list[Ticket])
+
 router = APIRouter(
     prefix="/tickets",
     tags=["tickets"],
     dependencies=[Depends(verify_api_key)],
 )
 
+# Separate router for the batch path, which does not fit under the
+# /tickets prefix ("/tickets:batch" is a sibling path, not a sub-path).
+batch_router = APIRouter(
+    tags=["tickets"],
+    dependencies=[Depends(verify_api_key)],
+)
+
 
 @router.post("", response_model=Ticket, status_code=status.HTTP_201_CREATED)
-async def create_ticket(data: TicketCreate):
+def create_ticket(data: TicketCreate):
     """Create a new ticket.
 
     Args:
@@ -35,7 +96,7 @@ async def create_ticket(data: TicketCreate):
 
 
 @router.get("", response_model=list[Ticket])
-async def list_tickets(
+def list_tickets(
     status: Optional[TicketStatus] = Query(None, description="Filter by status"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum records to return"),
@@ -50,11 +111,17 @@ async def list_tickets(
     Returns:
         List of tickets sorted by creation date (newest first).
     """
-    return storage.list_all(status=status, skip=skip, limit=limit)
+    tickets = storage.list_all(status=status, skip=skip, limit=limit)
+    # Returning a Response bypasses FastAPI's per-item re-validation; the
+    # response_model above still documents the schema in OpenAPI.
+    return Response(
+        content=_TICKET_LIST_ADAPTER.dump_json(tickets),
+        media_type="application/json",
+    )
 
 
 @router.get("/{ticket_id}", response_model=Ticket)
-async def get_ticket(ticket_id: UUID):
+def get_ticket(ticket_id: UUID = Depends(_ticket_id_param)):
     """Get a specific ticket by ID.
 
     Args:
@@ -66,17 +133,14 @@ async def get_ticket(ticket_id: UUID):
     Raises:
         HTTPException: 404 if ticket not found.
     """
-    ticket = storage.get(str(ticket_id))
+    ticket = storage.get(ticket_id)
     if not ticket:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Ticket with ID '{ticket_id}' not found",
-        )
+        raise _not_found(ticket_id)
     return ticket
 
 
 @router.patch("/{ticket_id}", response_model=Ticket)
-async def update_ticket(ticket_id: UUID, data: TicketUpdate):
+def update_ticket(data: TicketUpdate, ticket_id: UUID = Depends(_ticket_id_param)):
     """Update an existing ticket.
 
     Args:
@@ -90,13 +154,9 @@ async def update_ticket(ticket_id: UUID, data: TicketUpdate):
         HTTPException: 404 if ticket not found.
         HTTPException: 422 if status is RESOLVED but no resolution provided.
     """
-    ticket_id_str = str(ticket_id)
-    existing = storage.get(ticket_id_str)
+    existing = storage.get(ticket_id)
     if not existing:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Ticket with ID '{ticket_id}' not found",
-        )
+        raise _not_found(ticket_id)
 
     # Business rule: resolution required when setting status to RESOLVED
     if data.status == TicketStatus.RESOLVED:
@@ -108,11 +168,11 @@ async def update_ticket(ticket_id: UUID, data: TicketUpdate):
                 detail="Resolution is required when setting status to RESOLVED",
             )
 
-    return storage.update(ticket_id_str, data)
+    return storage.update(ticket_id, data)
 
 
 @router.delete("/{ticket_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_ticket(ticket_id: UUID):
+def delete_ticket(ticket_id: UUID = Depends(_ticket_id_param)):
     """Delete a ticket.
 
     Args:
@@ -121,9 +181,98 @@ async def delete_ticket(ticket_id: UUID):
     Raises:
         HTTPException: 404 if ticket not found.
     """
-    if not storage.delete(str(ticket_id)):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Ticket with ID '{ticket_id}' not found",
-        )
+    if not storage.delete(ticket_id):
+        raise _not_found(ticket_id)
     return None
+
+
+def _execute_batch_operation(operation: BatchOperation) -> BatchResult:
+    """Execute a single batch operation against storage.
+
+    Errors are captured per operation rather than raised, so one failing
+    operation does not abort the rest of the batch.
+
+    Args:
+        operation: The operation to execute.
+
+    Returns:
+        The result of the operation with success flag and data or error.
+    """
+    args = operation.args
+
+    try:
+        if operation.op == "create":
+            ticket = storage.create(TicketCreate(**args))
+            return BatchResult(success=True, data=ticket)
+
+        if operation.op == "list":
+            status_arg = args.get("status")
+            skip = int(args.get("skip", 0))
+            limit = int(args.get("limit", 100))
+            # Mirror the bounds Query() enforces on GET /tickets; a negative
+            # skip would otherwise slice from the end of the snapshot.
+            if skip < 0 or not 1 <= limit <= 1000:
+                return BatchResult(
+                    success=False,
+                    error="Invalid arguments for 'list': "
+                    "skip must be >= 0 and limit between 1 and 1000",
+                )
+            tickets = storage.list_all(
+                status=TicketStatus(status_arg) if status_arg else None,
+                skip=skip,
+                limit=limit,
+            )
+            return BatchResult(success=True, data=tickets)
+
+        ticket_id = UUID(str(args["ticket_id"]))
+
+        if operation.op == "get":
+            ticket = storage.get(ticket_id)
+            if not ticket:
+                return BatchResult(success=False, error=f"Ticket with ID '{ticket_id}' not found")
+            return BatchResult(success=True, data=ticket)
+
+        if operation.op == "update":
+            existing = storage.get(ticket_id)
+            if not existing:
+                return BatchResult(success=False, error=f"Ticket with ID '{ticket_id}' not found")
+
+            data = TicketUpdate(**{k: v for k, v in args.items() if k != "ticket_id"})
+            # Business rule: resolution required when setting status to RESOLVED
+            if (
+                data.status == TicketStatus.RESOLVED
+                and data.resolution is None
+                and existing.resolution is None
+            ):
+                return BatchResult(
+                    success=False,
+                    error="Resolution is required when setting status to RESOLVED",
+                )
+            return BatchResult(success=True, data=storage.update(ticket_id, data))
+
+        # operation.op == "delete" (the model validates op against the Literal)
+        if not storage.delete(ticket_id):
+            return BatchResult(success=False, error=f"Ticket with ID '{ticket_id}' not found")
+        return BatchResult(success=True, data=None)
+
+    except ValidationError as e:
+        return BatchResult(success=False, error=f"Invalid arguments for '{operation.op}': {e}")
+    except (KeyError, TypeError, ValueError) as e:
+        # TypeError covers non-coercible skip/limit values (e.g. null, lists)
+        return BatchResult(success=False, error=f"Invalid arguments for '{operation.op}': {e}")
+
+
+@batch_router.post("/tickets:batch", response_model=list[BatchResult])
+def batch_ticket_operations(operations: list[BatchOperation]):
+    """Execute multiple ticket operations in a single request.
+
+    Collapses N client round-trips into one for callers (such as the
+    agent) that need several independent operations per turn.
+
+    Args:
+        operations: List of operations to execute in order.
+
+    Returns:
+        List of per-operation results, in the same order as the input.
+    """
+    return [_execute_batch_operation(operation) for operation in operations]
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Analyze a PR diff using OpenAI and generate a review comment."""
 
+import functools
 import os
 import sys
 
@@ -35,8 +36,14 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4")
 
 
+@functools.cache
 def get_client():
-    """Get the appropriate OpenAI client (Azure or standard)."""
+    """Get the appropriate OpenAI client (Azure or standard), built once.
+
+    Cached so repeated analyze_diff calls reuse the same client and HTTP
+    session instead of reconstructing both per call. Use
+    get_client.cache_clear() to rebuild after changing credentials.
+    """
     if AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_API_KEY:
         return AzureOpenAI(
             azure_endpoint=AZURE_OPENAI_ENDPOINT,
@@ -49,8 +56,13 @@ def get_client():
         return None, None
 
 
-def analyze_diff(diff_content: str) -> str:
-    """Analyze the diff using OpenAI."""
+def analyze_diff(diff_content: str, truncated: bool = False) -> str:
+    """Analyze the diff using OpenAI.
+
+    Args:
+        diff_content: The diff text, already capped at MAX_DIFF_SIZE.
+        truncated: Whether the diff was cut off at the size limit.
+    """
     client, model = get_client()
 
     if not client:
@@ -60,9 +72,9 @@ def analyze_diff(diff_content: str) -> str:
     if len(diff_content.strip()) < MIN_DIFF_SIZE:
         return "Changes are minimal - no detailed review needed."
 
-    # Truncate very large diffs to avoid token limits
-    if len(diff_content) > MAX_DIFF_SIZE:
-        diff_content = diff_content[:MAX_DIFF_SIZE] + "\n\n... (diff truncated)"
+    # The caller already capped the read; just mark the cut for the model
+    if truncated:
+        diff_content += "\n\n... (diff truncated)"
 
     try:
         response = client.chat.completions.create(
@@ -91,16 +103,21 @@ def main():
     diff_file = sys.argv[1]
 
     try:
-        with open(diff_file) as f:
-            diff_content = f.read()
+        # Read at most the size cap plus one byte to detect truncation,
+        # instead of loading an arbitrarily large diff and re-slicing it
+        with open(diff_file, "rb") as f:
+            raw_diff = f.read(MAX_DIFF_SIZE + 1)
     except FileNotFoundError:
         print(f"Error: File {diff_file} not found")
         sys.exit(1)
 
+    truncated = len(raw_diff) > MAX_DIFF_SIZE
+    diff_content = raw_diff[:MAX_DIFF_SIZE].decode("utf-8", errors="replace")
+
     if not diff_content.strip():
         review = "No changes detected in this PR."
     else:
-        review = analyze_diff(diff_content)
+        review = analyze_diff(diff_content, truncated=truncated)
 
     comment = f"""## AI Code Review
 
@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from agent.agent import MAX_MESSAGE_HISTORY, MAX_TOOL_ITERATIONS, SYSTEM_PROMPT
+from agent.agent import (
+    MAX_MESSAGE_HISTORY,
+    MAX_TOOL_ITERATIONS,
+    MESSAGE_HISTORY_HIGH_WATER,
+    STALE_TOOL_RESULT,
+    SYSTEM_PROMPT_INVARIANT,
+)
 
 AZURE_ENV = {
     "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com",
@@ -15,6 +22,37 @@ AZURE_ENV = {
 }
 
 
+def make_stream(chunks):
+    """Build an async iterator over completion chunks, as the SDK returns."""
+
+    async def iterate():
+        for chunk in chunks:
+            yield chunk
+
+    return iterate()
+
+
+def content_chunk(text, finish_reason=None):
+    """Build a streaming chunk carrying a content token."""
+    delta = MagicMock()
+    delta.content = text
+    delta.tool_calls = None
+    return MagicMock(choices=[MagicMock(delta=delta, finish_reason=finish_reason)])
+
+
+def tool_call_chunk(index, id=None, name=None, arguments=None, finish_reason=None):
+    """Build a streaming chunk carrying a tool-call fragment."""
+    fragment = MagicMock()
+    fragment.index = index
+    fragment.id = id
+    fragment.function.name = name
+    fragment.function.arguments = arguments
+    delta = MagicMock()
+    delta.content = None
+    delta.tool_calls = [fragment]
+    return MagicMock(choices=[MagicMock(delta=delta, finish_reason=finish_reason)])
+
+
 class TestTicketingAgentInit:
     """Tests for agent initialization."""
 
@@ -44,7 +82,7 @@ class TestTicketingAgentInit:
     def test_init_with_azure_credentials(self):
         """Should initialize with Azure OpenAI credentials."""
         with patch.dict("os.environ", AZURE_ENV, clear=True):
-            with patch("agent.agent.AzureOpenAI") as mock_azure:
+            with patch("openai.AsyncAzureOpenAI") as mock_azure:
                 from agent.agent import TicketingAgent
 
                 agent = TicketingAgent()
@@ -59,8 +97,9 @@ class TestTicketingAgentChat:
     def mock_agent(self):
         """Create an agent with a mocked Azure OpenAI client."""
         with patch.dict("os.environ", AZURE_ENV, clear=True):
-            with patch("agent.agent.AzureOpenAI") as mock_azure:
+            with patch("openai.AsyncAzureOpenAI") as mock_azure:
                 mock_client = MagicMock()
+                mock_client.chat.completions.create = AsyncMock()
                 mock_azure.return_value = mock_client
 
                 from agent.agent import TicketingAgent
@@ -70,74 +109,177 @@ class TestTicketingAgentChat:
                 agent.close()
 
     def test_chat_returns_response(self, mock_agent):
-        """Should return response from Azure OpenAI."""
+        """Should assemble the streamed response from Azure OpenAI."""
         agent, mock_client = mock_agent
 
-        mock_message = MagicMock()
-        mock_message.tool_calls = None
-        mock_message.content = "Hello! How can I help you?"
-
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock(message=mock_message)]
-
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_client.chat.completions.create.return_value = make_stream(
+            [content_chunk("Hello! "), content_chunk("How can I help you?")]
+        )
 
         result = agent.chat("Hello")
 
         assert result == "Hello! How can I help you?"
         assert len(agent.messages) == 3  # system + user + assistant
 
-    def test_chat_executes_tool_calls(self, mock_agent):
-        """Should execute tool calls and return a final response."""
+    def test_chat_streams_tokens_via_callback(self, mock_agent):
+        """Should invoke the on_token callback with each content token."""
         agent, mock_client = mock_agent
 
-        mock_tool_call = MagicMock()
-        mock_tool_call.id = "call_123"
-        mock_tool_call.function.name = "list_tickets"
-        mock_tool_call.function.arguments = "{}"
+        mock_client.chat.completions.create.return_value = make_stream(
+            [content_chunk("Hello! "), content_chunk("How can I help you?")]
+        )
 
-        mock_tool_message = MagicMock()
-        mock_tool_message.tool_calls = [mock_tool_call]
-        mock_tool_message.content = None
+        tokens = []
+        agent.chat("Hello", on_token=tokens.append)
 
-        mock_final_message = MagicMock()
-        mock_final_message.tool_calls = None
-        mock_final_message.content = "Here are your tickets."
+        assert tokens == ["Hello! ", "How can I help you?"]
+
+    def test_chat_merges_tool_call_argument_fragments(self, mock_agent):
+        """Should merge streamed tool-call fragments by index before executing."""
+        agent, mock_client = mock_agent
 
         mock_client.chat.completions.create.side_effect = [
-            MagicMock(choices=[MagicMock(message=mock_tool_message)]),
-            MagicMock(choices=[MagicMock(message=mock_final_message)]),
+            make_stream(
+                [
+                    tool_call_chunk(0, id="call_123", name="get_ticket", arguments='{"tick'),
+                    tool_call_chunk(0, arguments='et_id": "123"}'),
+                ]
+            ),
+            make_stream([content_chunk("Found it.")]),
         ]
 
-        with patch.object(agent.client, "list_tickets") as mock_list:
-            mock_list.return_value = {"success": True, "data": []}
+        mock_get = AsyncMock(return_value={"success": True, "data": {"id": "123"}})
+        with patch.dict(agent._dispatch, {"get_ticket": mock_get}):
+            result = agent.chat("Get ticket 123")
+
+        assert result == "Found it."
+        mock_get.assert_called_once_with(ticket_id="123")
+
+    def test_chat_executes_tool_calls(self, mock_agent):
+        """Should execute tool calls and return a final response."""
+        agent, mock_client = mock_agent
+
+        mock_client.chat.completions.create.side_effect = [
+            make_stream([tool_call_chunk(0, id="call_123", name="list_tickets", arguments="{}")]),
+            make_stream([content_chunk("Here are your tickets.")]),
+        ]
+
+        mock_list = AsyncMock(return_value={"success": True, "data": []})
+        with patch.dict(agent._dispatch, {"list_tickets": mock_list}):
             result = agent.chat("List my tickets")
 
         assert result == "Here are your tickets."
         mock_list.assert_called_once()
 
+    def test_chat_batches_parallel_tool_calls(self, mock_agent):
+        """Should coalesce multiple tool calls from one turn into a batch request."""
+        agent, mock_client = mock_agent
+
+        mock_client.chat.completions.create.side_effect = [
+            make_stream(
+                [
+                    tool_call_chunk(0, id="call_1", name="list_tickets", arguments="{}"),
+                    tool_call_chunk(
+                        1, id="call_2", name="get_ticket", arguments='{"ticket_id": "123"}'
+                    ),
+                ]
+            ),
+            make_stream([content_chunk("Done.")]),
+        ]
+
+        with patch.object(agent.client, "batch") as mock_batch:
+            mock_batch.return_value = {
+                "success": True,
+                "data": [
+                    {"success": True, "data": [], "error": None},
+                    {"success": True, "data": {"id": "123"}, "error": None},
+                ],
+            }
+            result = agent.chat("List tickets and get ticket 123")
+
+        assert result == "Done."
+        mock_batch.assert_called_once_with(
+            [
+                {"op": "list", "args": {}},
+                {"op": "get", "args": {"ticket_id": "123"}},
+            ]
+        )
+
+        # Tool result messages must stay in tool_call order
+        tool_messages = [m for m in agent.messages if m.get("role") == "tool"]
+        assert [m["tool_call_id"] for m in tool_messages] == ["call_1", "call_2"]
+
     def test_chat_stops_after_max_iterations(self, mock_agent):
         """Should stop after max tool iterations."""
         agent, mock_client = mock_agent
 
-        mock_tool_call = MagicMock()
-        mock_tool_call.id = "call_123"
-        mock_tool_call.function.name = "list_tickets"
-        mock_tool_call.function.arguments = "{}"
+        # Each iteration requests a different ticket so neither loop
+        # detection nor the read cache cuts the loop short
+        mock_client.chat.completions.create.side_effect = [
+            make_stream(
+                [
+                    tool_call_chunk(
+                        0, id=f"call_{i}", name="get_ticket", arguments=f'{{"ticket_id": "{i}"}}'
+                    )
+                ]
+            )
+            for i in range(MAX_TOOL_ITERATIONS)
+        ]
 
-        mock_tool_message = MagicMock()
-        mock_tool_message.tool_calls = [mock_tool_call]
+        mock_get = AsyncMock(return_value={"success": True, "data": {"id": "123"}})
+        with patch.dict(agent._dispatch, {"get_ticket": mock_get}):
+            result = agent.chat("Check all my tickets")
 
-        mock_client.chat.completions.create.return_value = MagicMock(
-            choices=[MagicMock(message=mock_tool_message)]
-        )
+        assert "unable to complete" in result.lower()
+        assert mock_client.chat.completions.create.call_count == MAX_TOOL_ITERATIONS
+        assert mock_get.call_count == MAX_TOOL_ITERATIONS
+
+    def test_chat_stops_on_repeated_tool_calls(self, mock_agent):
+        """Should break out of the tool loop when the model repeats itself."""
+        agent, mock_client = mock_agent
+
+        mock_client.chat.completions.create.side_effect = [
+            make_stream([tool_call_chunk(0, id=f"call_{i}", name="list_tickets", arguments="{}")])
+            for i in range(MAX_TOOL_ITERATIONS)
+        ]
 
-        with patch.object(agent.client, "list_tickets") as mock_list:
-            mock_list.return_value = {"success": True, "data": []}
+        mock_list = AsyncMock(return_value={"success": True, "data": []})
+        with patch.dict(agent._dispatch, {"list_tickets": mock_list}):
             result = agent.chat("List my tickets")
 
         assert "unable to complete" in result.lower()
-        assert mock_list.call_count == MAX_TOOL_ITERATIONS
+        # The second identical turn triggers loop detection, not ten calls
+        assert mock_client.chat.completions.create.call_count == 2
+
+    def test_chat_stops_on_length_finish_reason(self, mock_agent):
+        """Should end the tool loop when the completion hits the token limit."""
+        agent, mock_client = mock_agent
+
+        mock_client.chat.completions.create.return_value = make_stream(
+            [content_chunk("Partial answer that was cut", finish_reason="length")]
+        )
+
+        result = agent.chat("Summarize everything")
+
+        assert result == "Partial answer that was cut"
+        assert mock_client.chat.completions.create.call_count == 1
+
+    def test_chat_length_cutoff_without_content_stores_fallback(self, mock_agent):
+        """Should never leave a null-content assistant message after a cutoff."""
+        agent, mock_client = mock_agent
+
+        # The cutoff lands mid-tool-call: no content tokens at all
+        mock_client.chat.completions.create.return_value = make_stream(
+            [tool_call_chunk(0, id="call_1", name="get_ticket", finish_reason="length")]
+        )
+
+        result = agent.chat("Get my ticket")
+
+        assert "cut off" in result
+        last = agent.messages[-1]
+        assert last["role"] == "assistant"
+        assert last["content"] == result
+        assert "tool_calls" not in last
 
     def test_reset_conversation(self, mock_agent):
         """Should reset conversation to the initial state."""
@@ -148,7 +290,7 @@ class TestTicketingAgentChat:
 
         assert len(agent.messages) == 1
         assert agent.messages[0]["role"] == "system"
-        assert agent.messages[0]["content"] == SYSTEM_PROMPT
+        assert agent.messages[0]["content"] == SYSTEM_PROMPT_INVARIANT
 
 
 class TestTicketingAgentTools:
@@ -158,7 +300,7 @@ class TestTicketingAgentTools:
     def mock_agent(self):
         """Create an agent with a mocked Azure OpenAI client."""
         with patch.dict("os.environ", AZURE_ENV, clear=True):
-            with patch("agent.agent.AzureOpenAI"):
+            with patch("openai.AsyncAzureOpenAI"):
                 from agent.agent import TicketingAgent
 
                 agent = TicketingAgent()
@@ -167,11 +309,13 @@ class TestTicketingAgentTools:
 
     def test_execute_create_ticket(self, mock_agent):
         """Should execute create_ticket tool."""
-        with patch.object(mock_agent.client, "create_ticket") as mock_create:
-            mock_create.return_value = {"success": True, "data": {"id": "123"}}
-            result = mock_agent._execute_tool(
-                "create_ticket",
-                {"title": "Test", "description": "Test desc"},
+        mock_create = AsyncMock(return_value={"success": True, "data": {"id": "123"}})
+        with patch.dict(mock_agent._dispatch, {"create_ticket": mock_create}):
+            result = asyncio.run(
+                mock_agent._execute_tool(
+                    "create_ticket",
+                    {"title": "Test", "description": "Test desc"},
+                )
             )
 
         assert "success" in result
@@ -179,29 +323,31 @@ class TestTicketingAgentTools:
 
     def test_execute_list_tickets(self, mock_agent):
         """Should execute list_tickets tool."""
-        with patch.object(mock_agent.client, "list_tickets") as mock_list:
-            mock_list.return_value = {"success": True, "data": []}
-            result = mock_agent._execute_tool("list_tickets", {"status": "OPEN"})
+        mock_list = AsyncMock(return_value={"success": True, "data": []})
+        with patch.dict(mock_agent._dispatch, {"list_tickets": mock_list}):
+            result = asyncio.run(mock_agent._execute_tool("list_tickets", {"status": "OPEN"}))
 
         assert "success" in result
         mock_list.assert_called_once_with(status="OPEN")
 
     def test_execute_get_ticket(self, mock_agent):
         """Should execute get_ticket tool."""
-        with patch.object(mock_agent.client, "get_ticket") as mock_get:
-            mock_get.return_value = {"success": True, "data": {"id": "123"}}
-            result = mock_agent._execute_tool("get_ticket", {"ticket_id": "123"})
+        mock_get = AsyncMock(return_value={"success": True, "data": {"id": "123"}})
+        with patch.dict(mock_agent._dispatch, {"get_ticket": mock_get}):
+            result = asyncio.run(mock_agent._execute_tool("get_ticket", {"ticket_id": "123"}))
 
         assert "success" in result
         mock_get.assert_called_once_with(ticket_id="123")
 
     def test_execute_update_ticket(self, mock_agent):
         """Should execute update_ticket tool."""
-        with patch.object(mock_agent.client, "update_ticket") as mock_update:
-            mock_update.return_value = {"success": True, "data": {"id": "123"}}
-            result = mock_agent._execute_tool(
-                "update_ticket",
-                {"ticket_id": "123", "status": "RESOLVED", "resolution": "Fixed"},
+        mock_update = AsyncMock(return_value={"success": True, "data": {"id": "123"}})
+        with patch.dict(mock_agent._dispatch, {"update_ticket": mock_update}):
+            result = asyncio.run(
+                mock_agent._execute_tool(
+                    "update_ticket",
+                    {"ticket_id": "123", "status": "RESOLVED", "resolution": "Fixed"},
+                )
             )
 
         assert "success" in result
@@ -209,16 +355,50 @@ class TestTicketingAgentTools:
 
     def test_execute_delete_ticket(self, mock_agent):
         """Should execute delete_ticket tool."""
-        with patch.object(mock_agent.client, "delete_ticket") as mock_delete:
-            mock_delete.return_value = {"success": True, "data": None}
-            result = mock_agent._execute_tool("delete_ticket", {"ticket_id": "123"})
+        mock_delete = AsyncMock(return_value={"success": True, "data": None})
+        with patch.dict(mock_agent._dispatch, {"delete_ticket": mock_delete}):
+            result = asyncio.run(mock_agent._execute_tool("delete_ticket", {"ticket_id": "123"}))
 
         assert "success" in result
         mock_delete.assert_called_once_with(ticket_id="123")
 
+    def test_execute_repeated_read_served_from_cache(self, mock_agent):
+        """Should serve a repeated identical read from the cache."""
+        mock_get = AsyncMock(return_value={"success": True, "data": {"id": "123"}})
+        with patch.dict(mock_agent._dispatch, {"get_ticket": mock_get}):
+            first = asyncio.run(mock_agent._execute_tool("get_ticket", {"ticket_id": "123"}))
+            second = asyncio.run(mock_agent._execute_tool("get_ticket", {"ticket_id": "123"}))
+
+        assert first == second
+        mock_get.assert_called_once()
+
+    def test_execute_write_invalidates_read_cache(self, mock_agent):
+        """Should re-fetch reads after a successful write."""
+        mock_get = AsyncMock(return_value={"success": True, "data": {"id": "123"}})
+        mock_update = AsyncMock(return_value={"success": True, "data": {"id": "123"}})
+        with patch.dict(
+            mock_agent._dispatch, {"get_ticket": mock_get, "update_ticket": mock_update}
+        ):
+            asyncio.run(mock_agent._execute_tool("get_ticket", {"ticket_id": "123"}))
+            asyncio.run(
+                mock_agent._execute_tool("update_ticket", {"ticket_id": "123", "title": "New"})
+            )
+            asyncio.run(mock_agent._execute_tool("get_ticket", {"ticket_id": "123"}))
+
+        assert mock_get.call_count == 2
+
+    def test_execute_invalid_args_skips_http_call(self, mock_agent):
+        """Should reject schema-invalid arguments without an HTTP round-trip."""
+        mock_get = AsyncMock(return_value={"success": True, "data": {"id": "123"}})
+        with patch.dict(mock_agent._dispatch, {"get_ticket": mock_get}):
+            result = asyncio.run(mock_agent._execute_tool("get_ticket", {}))
+
+        assert "Invalid arguments" in result
+        mock_get.assert_not_called()
+
     def test_execute_unknown_tool(self, mock_agent):
         """Should return error for an unknown tool."""
-        result = mock_agent._execute_tool("unknown_tool", {})
+        result = asyncio.run(mock_agent._execute_tool("unknown_tool", {}))
 
         assert "Unknown tool" in result
 
@@ -230,18 +410,90 @@ class TestMessageHistoryTrimming:
     def mock_agent(self):
         """Create an agent with a mocked Azure OpenAI client."""
         with patch.dict("os.environ", AZURE_ENV, clear=True):
-            with patch("agent.agent.AzureOpenAI"):
+            with patch("openai.AsyncAzureOpenAI"):
                 from agent.agent import TicketingAgent
 
                 agent = TicketingAgent()
                 yield agent
                 agent.close()
 
-    def test_trim_message_history(self, mock_agent):
-        """Should trim message history when exceeding max."""
+    def test_trim_below_high_water_keeps_history(self, mock_agent):
+        """Should leave history untouched below the high-water mark (stable prefix)."""
         for i in range(MAX_MESSAGE_HISTORY + 10):
             mock_agent.messages.append({"role": "user", "content": f"message {i}"})
 
+        before = list(mock_agent.messages)
+        mock_agent._trim_message_history()
+
+        assert mock_agent.messages == before
+
+    def test_condense_rewrites_superseded_tool_results(self, mock_agent):
+        """Should stub out older tool results superseded by a later call."""
+
+        def tool_turn(call_id, content):
+            return [
+                {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [
+                        {
+                            "id": call_id,
+                            "type": "function",
+                            "function": {
+                                "name": "get_ticket",
+                                "arguments": '{"ticket_id": "123"}',
+                            },
+                        }
+                    ],
+                },
+                {"role": "tool", "tool_call_id": call_id, "content": content},
+            ]
+
+        mock_agent.messages.extend(tool_turn("call_1", '{"success":true,"data":{"old":1}}'))
+        mock_agent.messages.extend(tool_turn("call_2", '{"success":true,"data":{"new":2}}'))
+
+        mock_agent._condense_tool_history()
+
+        tool_messages = [m for m in mock_agent.messages if m.get("role") == "tool"]
+        assert tool_messages[0]["content"] == STALE_TOOL_RESULT
+        assert tool_messages[1]["content"] == '{"success":true,"data":{"new":2}}'
+
+    def test_condense_keeps_distinct_write_results(self, mock_agent):
+        """Should never stub write results; each carries unique data like ids."""
+
+        def create_turn(call_id, title, content):
+            return [
+                {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [
+                        {
+                            "id": call_id,
+                            "type": "function",
+                            "function": {
+                                "name": "create_ticket",
+                                "arguments": f'{{"title": "{title}", "description": "d"}}',
+                            },
+                        }
+                    ],
+                },
+                {"role": "tool", "tool_call_id": call_id, "content": content},
+            ]
+
+        mock_agent.messages.extend(create_turn("call_1", "First", '{"data":{"id":"a"}}'))
+        mock_agent.messages.extend(create_turn("call_2", "Second", '{"data":{"id":"b"}}'))
+
+        mock_agent._condense_tool_history()
+
+        tool_messages = [m for m in mock_agent.messages if m.get("role") == "tool"]
+        assert tool_messages[0]["content"] == '{"data":{"id":"a"}}'
+        assert tool_messages[1]["content"] == '{"data":{"id":"b"}}'
+
+    def test_trim_above_high_water_drops_to_max(self, mock_agent):
+        """Should trim down to the max once history crosses the high-water mark."""
+        for i in range(MESSAGE_HISTORY_HIGH_WATER + 10):
+            mock_agent.messages.append({"role": "user", "content": f"message {i}"})
+
         mock_agent._trim_message_history()
 
         assert len(mock_agent.messages) == MAX_MESSAGE_HISTORY
@@ -0,0 +1,25 @@
+"""Tests for the agent HTTP client lifecycle.
+
+Kept separate from the API-facing client tests so these run without
+importing the FastAPI app, storage, or auth modules.
+"""
+
+import asyncio
+
+from agent.client import TicketingClient
+
+
+class TestTicketingClientContextManager:
+    """Tests for context manager support."""
+
+    def test_context_manager_closes_client(self):
+        """Should close client when exiting context."""
+
+        async def use_client() -> TicketingClient:
+            async with TicketingClient() as client:
+                assert client.client is not None
+            return client
+
+        client = asyncio.run(use_client())
+        # After exit, a client should be closed
+        assert client.client.is_closed